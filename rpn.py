@@ -13,6 +13,9 @@ divide 22 by 7 then add 4 to the result. Unary operators work on what is in the
 x register. Binary operators use the x & y registers.
 
 A complete list of operators can be displayed by typing in: "help op"
+
+Runs under CPython or PyPy (start it with "pypy3 rpn.py"); readline is
+used for command history when it's available.
 """
 
 version = "RPN Calculator version 1.09"
@@ -78,10 +81,19 @@ version = "RPN Calculator version 1.09"
 # small numbers in scientific notation.  It just shows them as '0.0'
 
 import math
+import operator
 import os
-import ast
+import functools
+import json
 import random
-import readline  # all you need to recall command history.
+import re
+import sys
+from collections import deque
+
+try:
+  import readline  # all you need to recall command history.
+except ImportError:  # not every Python has it (Windows, some PyPy builds)
+  pass
 
 # Global variables:
 # stack_size can be changed below (4 is the minimum), but only if
@@ -91,10 +103,13 @@ import readline  # all you need to recall command history.
 # op_dict is a help file for all commands.
 stack_size = 4  # size of the stack.
 stack_min = 4  # minimum stack size.
-stack = []  # List of ? size to hold the stack's values.
+stack = deque()  # Holds the stack's values; 'x' is stack[0].
 mem = {}  # Dictionary of memory registers.
 memnam = os.path.splitext(__file__)[0] + ".mem"
 prognam = os.path.splitext(__file__)[0] + ".txt"
+# what 'edit' opens prognam with: $EDITOR, unless it's unset or blank.
+default_editor = "notepad" if os.name == "nt" else "vim"
+editor = os.environ.get("EDITOR", "").strip() or default_editor
 
 # common usage: print(f'{XXX}')
 if os.name == "posix":  # other OS might not handle these properly:
@@ -125,6 +140,14 @@ else:
   SS2 = "^2"
   OVR = "(mn)"
   SQR = ""
+# no colors (or screen to clear) when the output isn't a terminal:
+if not sys.stdout.isatty():
+  RED = GRN = YLW = BLU = PUR = CYN = WHT = CLS = ""
+
+# The error messages, put together once the colors are known.
+# usage: sys.stdout.write(NOT_FOUND % ("Register", name))
+NOT_FOUND = f"{RED}%s {WHT}%s{RED} not found.{WHT}\n\n"
+ERROR = f"{RED}%s: {WHT}%s\n\n"
 
 kbsc2 = {  # just so we don't have to use shift key very much
   "c.f": "c>f",
@@ -142,6 +165,8 @@ kbsc2 = {  # just so we don't have to use shift key very much
   "=": "+",  # we don't use '=' in RPN, so save the shift key.
   "**": "^",  # This one's just for Python compatibility.
 }
+kbsc_all = {}  # kbsc & kbsc2 together; see merge_shortcuts()
+kbsc_rev = {}  # operator: its (first) kbsc shortcut, for 'help'
 
 op_dict = {  # dictionary of operators for 'help' function
   "+": "Sums the contents of x and y.",
@@ -258,98 +283,1147 @@ on that operator, while 'op' will list all operators.",
     'r', 'a', or 'b' to return that value to the stack.",
 }
 
+# what 'help op' prints, operator names sorted, uppercase & quoted.
+help_op_text = (
+  f"{YLW}Type 'help xxx' for specific help on an operator.\n"
+  + "Available operators are:\n"
+  + "".join(f"'{x}' " for x in sorted(k.upper() for k in op_dict))
+  + "\nOperators are not case sensitive.\n"
+  + f"Shortcut key shows in parentheses.{WHT}\n\n"
+)
+
+
 # function to initialize the size of the stack and fill it with zeros:
 def initstack(st_size):
   """Initializes the stack.
   Fills it with zeros if the .mem file is missing."""
-  stack = []
   st_size = max(st_size, stack_min)
-  while st_size:
-    stack.append(0.0)
-    st_size -= 1
-  return stack
+  return deque([0.0] * st_size, maxlen=st_size)
 
 
 # push a number onto the bottom of the stack raising everything
-# else up.
+# else up.  The deque's maxlen takes care of discarding 't:'.
 def push(num):
   """Push a number onto the stack."""
-  i = len(stack) - 1
-  while i:
-    stack[i] = stack[i - 1]
-    i -= 1
-  stack[0] = float(num)
+  stack.appendleft(float(num))
 
 
 # pull a number off the bottom of stack and drop everything down one.
+# 't:' gets copied down and stays in 't:' (just like the HP-15c).
 def pull():
   """Pull a number off the stack."""
-  i = 0
-  num = stack[i]
-  while i < len(stack) - 1:
-    stack[i] = stack[i + 1]
-    i += 1
+  num = stack.popleft()
+  stack.append(stack[-1])
   return num
 
 
 # pull the program data from the text file.
-# apparently, 'for line in...' closes the file for you
-#   after reading the last line.  Thanks, Python!
+# read it in one go and drop the comments ('#' to the end of the line).
 def program_data(progf):
   """Copies .txt file to memory."""
   if os.path.exists(progf):
-    prog = ""
-    for line in open(progf, "r", encoding="utf-8"):
-      line = line.split("#")[0]
-      prog += line
-    prog = prog.split()
-    return prog
+    with open(progf, "r", encoding="utf-8") as fh:
+      return re.sub(r"#[^\n]*", "", fh.read()).split()
+
+
+# tells whether a file has changed: its modification time and size,
+# or None if it isn't there.
+def file_stamp(path):
+  """Returns (mtime, size) for path, or None if it's missing."""
+  try:
+    info = os.stat(path)
+  except OSError:
+    return None
+  return info.st_mtime_ns, info.st_size
+
+
+# statistical results derived from the summation registers.
+# needs at least 2 data points that aren't all the same.
+def stat_results(sr):
+  """Returns the means, std deviations, r, slope and y intercept."""
+  Sn = sr["Sn"]
+  Sx = sr["Sx"]
+  Sy = sr["Sy"]
+  dx = Sn * sr["Sx2"] - Sx * Sx  # n*Ex^2-(Ex)^2
+  dy = Sn * sr["Sy2"] - Sy * Sy  # n*Ey^2-(Ey)^2
+  if Sn > 1 and dx and dy:
+    dxy = Sn * sr["Sxy"] - Sx * Sy  # n*Exy-Ex*Ey
+    Sa = dxy / dx  # slope(a):
+    return {
+      "Mx": Sx / Sn,  # mean of x
+      "My": Sy / Sn,  # mean of y
+      # ox = sqrt((n*Ex^2-(Ex)^2)/(n*(n-1))) std deviation of x
+      "SDx": math.sqrt(dx / (Sn * (Sn - 1))),
+      # oy = sqrt((n*Ey^2-(Ey)^2)/(n*(n-1))) std deviation of y
+      "SDy": math.sqrt(dy / (Sn * (Sn - 1))),
+      # correlation coefficent(r):
+      "CCr": dxy / math.sqrt(dx * dy),
+      "Sa": Sa,
+      "YIb": Sy / Sn - Sa * Sx / Sn,  # y intercept(b):
+    }
+  return None
+
+
+stat_zero = {"Mx": 0, "My": 0, "SDx": 0, "SDy": 0, "CCr": 0, "Sa": 0, "YIb": 0}
+
+# what 'stat' displays, filled in from stat_regs and the stat results.
+stat_show_regs = (
+  f"{YLW}n:   {WHT}{{Sn:.0f}}\n"
+  f"{YLW}{SIG}x:  {WHT}{{Sx:.4f}}\n"
+  f"{YLW}{SIG}y:  {WHT}{{Sy:.4f}}\n"
+  f"{YLW}{SIG}x{SS2}: {WHT}{{Sx2:.4f}}\n"
+  f"{YLW}{SIG}y{SS2}: {WHT}{{Sy2:.4f}}\n"
+  f"{YLW}{SIG}xy: {WHT}{{Sxy:.4f}}\n"
+)
+stat_show_means = (
+  f"{YLW}x{OVR}:   {WHT}{{Mx:.4f}}\n"
+  f"{YLW}y{OVR}:   {WHT}{{My:.4f}}\n"
+)
+stat_show_sd = (
+  f"{YLW}{LSG}x:  {WHT}{{SDx:.4f}}\n"
+  f"{YLW}{LSG}y:  {WHT}{{SDy:.4f}}\n"
+)
+stat_show_fit = (
+  f"{YLW}r:   {WHT}{{CCr:.4f}}\n"
+  f"{YLW}a:   {WHT}{{Sa:.4f}}\n"
+  f"{YLW}b:   {WHT}{{YIb:.4f}}\n"
+)
+
+
+# Everything an operator might need to look at or change while a
+# command line (or a program) is being executed.
+class State:
+  """The calculator's state, shared by all of the operators."""
+
+  def __init__(self, mem, prog_listing, decimal_places, stat_regs):
+    self.mem = mem  # dictionary of memory registers
+    self.prog_listing = prog_listing  # user programs
+    self.decimal_places = decimal_places
+    self.stat_regs = stat_regs  # statistical summation registers
+    self._stats = dict(stat_zero)  # last good results from stat_regs
+    self.stats_dirty = True  # stat_regs changed since _stats was worked out
+    self.cmd_ln = []  # the command line (or program) being executed
+    self.running = False  # True while cmd_ln is the program (set by 'exc')
+    self.code = []  # cmd_ln after going through compile_program()
+    self.prog_code = None  # prog_listing, compiled the first time it's run
+    self.prog_labels = None  # prog_listing's labels, found the same way
+    self.it_r = 0  # token iterator
+    self.incr = True  # in case you want to stop it_r from incrementing
+    self.pdict = {}  # labels in the format: {name: location}
+    self.lbl_rtn = []  # where to go back to after a 'gsb'
+    self.mem_shown = None  # what 'mem' printed, until mem is changed
+    self.scut_shown = None  # what 'scut' printed, until kbsc is changed
+    self.prog_shown = None  # what 'prog' printed, until the program is edited
+
+  # only work the stat results out when somebody asks for them.
+  @property
+  def stats(self):
+    """Means, std deviations, r, a & b for the current stat_regs."""
+    if self.stats_dirty:
+      self._stats = stat_results(self.stat_regs) or self._stats
+      self.stats_dirty = False
+    return self._stats
+
+  @stats.setter
+  def stats(self, value):
+    self._stats = value
+    self.stats_dirty = False
+
+
+# Factorials and friends tend to get worked out over and over again
+# with the same arguments inside a program's loop, so remember the
+# answers.  The integer ones are handed ints to keep the keys cheap,
+# and only the float answers are kept, never a huge integer.
+@functools.lru_cache(maxsize=4096)
+def factorial(n):
+  """n! as a float."""
+  if n > 170:  # 171! is already too big for a float
+    raise OverflowError("factorial too large for a float")
+  return float(math.factorial(n))
+
+
+gamma = functools.lru_cache(maxsize=4096)(math.gamma)
+gcd = functools.lru_cache(maxsize=4096)(math.gcd)
+
+
+# math.comb & math.perm (Python 3.8+) never work out y! in full.
+@functools.lru_cache(maxsize=4096)
+def combinations(y, x):
+  """Combinations of x items out of y."""
+  return float(math.comb(y, x))
+
+
+@functools.lru_cache(maxsize=4096)
+def permutations(y, x):
+  """Permutations of x items out of y."""
+  return float(math.perm(y, x))
+
+
+# Most of the math operators just replace x with f(x), or x & y with
+# f(y, x).  These wrap the math function up in the operator when the
+# jump table is built so it isn't looked up in the math module every
+# time the operator runs.  They work on x (and y) where they sit in
+# the stack instead of pulling them off and pushing the answer back;
+# the binary ones then drop the old x (what pull() does, written out
+# so the busiest operators don't make a second call).  If fn fails the
+# stack is left the way it was.
+def unary(fn):
+  """Makes an operator that replaces x with fn(x)."""
+
+  def op(st):
+    stack[0] = float(fn(stack[0]))
+
+  return op
+
+
+def binary(fn):
+  """Makes an operator that replaces x & y with fn(y, x)."""
+
+  def op(st):
+    stack[1] = float(fn(stack[1], stack[0]))
+    stack.popleft()
+    stack.append(stack[-1])
+
+  return op
+
+
+# A number on the command line becomes an operator that pushes it.
+def number(num):
+  """Makes an operator that pushes num."""
+
+  def op(st):
+    stack.appendleft(num)
+
+  return op
+
+
+# A token that starts like a number but isn't one (e.g. '1,5') stops
+# the line with a 'Value error' when it's reached.
+def not_a_number(st):
+  """Raises ValueError for a malformed number."""
+  raise ValueError("not a number")
+
+
+# The operators.  Every operator is a function that takes the
+# calculator's State.  Operators that need the token(s) following
+# them on the command line move st.it_r along themselves.
+#
+# binary operators:
+#
+# addition:
+def op_add(st):
+  stack[1] += stack[0]
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# subtraction:
+def op_sub(st):
+  stack[1] -= stack[0]
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# multiplication:
+def op_mul(st):
+  stack[1] *= stack[0]
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# division:
+def op_div(st):
+  stack[1] /= stack[0]
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# y to the x, but only if the answer's a real number:
+def power(y, x):
+  """y ** x; a complex answer is a ValueError."""
+  result = y ** x
+  if isinstance(result, complex):  # a negative y to a fractional x
+    raise ValueError("complex result")
+  return result
+
+
+# raise y to the x:
+def op_pow(st):
+  stack[1] = power(stack[1], stack[0])
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# x root of y:
+def op_xroot(st):
+  stack[1] = power(stack[1], 1 / stack[0])
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# rectangular to polar conversion:
+def op_r2p(st, atan2=math.atan2, hypot=math.hypot):
+  x = stack[0]
+  y = stack[1]
+  ang = atan2(y, x)
+  mag = hypot(x, y)
+  stack[1] = ang  # angle
+  stack[0] = mag  # magnitude
+  print(
+    f"{YLW}Angle(y): {WHT}{ang:.4f}{YLW};"
+    + f" Magnitude(x): {WHT}{mag:.4f}\n"
+  )
+
+
+# polar to rectangular conversion:
+def op_p2r(st, sin=math.sin, cos=math.cos):
+  x = stack[0]  # magnitude
+  y = stack[1]  # angle
+  stack[1] = x * sin(y)  # y
+  stack[0] = x * cos(y)  # x
+
+
+# x percent of y (leaves y in the stack):
+def op_pct(st):
+  stack[0] = (stack[0] / 100) * stack[1]
+
+
+# percentage change from y to x (leaves y in the stack):
+def op_pctc(st):
+  stack[0] = (stack[0] / stack[1] - 1) * 100
+
+
+# combinations of x into y:
+def op_cnr(st):
+  stack[1] = combinations(int(stack[1]), int(stack[0]))
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# permutations of x in y:
+def op_pnr(st):
+  stack[1] = permutations(int(stack[1]), int(stack[0]))
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# greatest common divisor of x & y:
+def op_gcd(st):
+  stack[1] = float(gcd(int(stack[0]), int(stack[1])))  # forcing ints
+  stack.popleft()
+  stack.append(stack[-1])
+
+
+# unary operators:
+#
+# square of x:
+# (x * x quietly gives inf where x ** 2 raised, so check for that.)
+def op_sq(st, isinf=math.isinf):
+  x = stack[0]
+  sq = x * x
+  if isinf(sq) and not isinf(x):
+    raise OverflowError("square too large")
+  stack[0] = sq
+
+
+# Base of 10 raised to x:
+def op_tx(st):
+  stack[0] = 10.0 ** stack[0]
+
+
+# reciprocal of x (1/x):
+def op_rcp(st):
+  x = stack[0]
+  stack[0] = 1 / x
+
+
+# change sign of x:
+def op_chs(st):
+  x = stack[0]
+  stack[0] = -x
+
+
+# factorial of x:
+def op_fact(st):
+  stack[0] = factorial(int(stack[0]))
+
+
+# fractional portion of x:
+def op_frac(st, modf=math.modf):
+  stack[0] = modf(stack[0])[0]
+
+
+# integer portion of x:
+def op_int(st, modf=math.modf):
+  stack[0] = modf(stack[0])[1]
+
+
+# round a number to the display value
+def op_rnd(st):
+  stack[0] = round(stack[0], st.decimal_places)
+
+
+# convert a float into a ratio (y/x):
+def op_ratio(st):
+  num, den = stack[0].as_integer_ratio()
+  num, den = float(num), float(den)  # both, before x is touched
+  stack[0] = num
+  stack.appendleft(den)
+
+
+# conversion factors, worked out once:
+LTR_GAL = 231 * 2.54 ** 3 / 1000  # litres in a US gallon (231 cu. in.)
+LBS_KG = 2.204622622  # lbs. in a kilogram
+F_C = 9 / 5  # degrees F in a degree C
+
+
+# metric/imperial conversions:
+#
+# convert length in centimeters to inches:
+def op_in(st):
+  stack[0] /= 2.54
+
+
+# convert length in inches to centimeters:
+def op_cm(st):
+  stack[0] *= 2.54
+
+
+# convert volume in litres to gallons:
+def op_gal(st):
+  stack[0] /= LTR_GAL
+
+
+# convert volume in gallons to litres:
+def op_ltr(st):
+  stack[0] *= LTR_GAL
+
+
+# convert weight in kilograms to lbs.:
+def op_lbs(st):
+  stack[0] *= LBS_KG
+
+
+# convert weight in lbs. to kilograms:
+def op_kg(st):
+  stack[0] /= LBS_KG
+
+
+# convert temperature from celsius to fahrenheit:
+def op_c2f(st):
+  stack[0] = stack[0] * F_C + 32
+
+
+# convert temperature from fahrenheit to celsius:
+def op_f2c(st):
+  stack[0] = (stack[0] - 32) / F_C
+
+
+# Both time conversions count in whole ten-thousandths of a second
+# and split them up with divmod, so the minutes and seconds are exact
+# instead of picking up round-off from repeated float multiplies.
+# A negative time is worked out on its size; the sign is shown on the
+# hours only and put back on the result.
+#
+# convert h.mmss to a decimal value:
+def op_dh(st):
+  x = pull()
+  neg = "-" if x < 0 else ""
+  h, mmss = divmod(round(abs(x) * 100_000_000), 100_000_000)
+  m, s = divmod(mmss, 1_000_000)
+  s /= 10_000
+  print(f"{YLW}{neg}{h}h:{m}m:{s}s{WHT}\n")
+  t = h + (m / 60) + (s / 3600)
+  push(-t if neg else t)
+
+
+# convert decimal time value to h.mmss:
+def op_hms(st):
+  x = pull()
+  neg = "-" if x < 0 else ""
+  h, mmss = divmod(round(abs(x) * 36_000_000), 36_000_000)
+  m, s = divmod(mmss, 600_000)
+  s /= 10_000
+  print(f"{YLW}{neg}{h}h:{m}m:{s}s{WHT}\n")
+  t = h + m / 100 + s / 10000
+  push(-t if neg else t)
+
+
+# constant(s):
+#
+# the approximate value of pi:
+def op_pi(st, pi=math.pi):
+  push(pi)
+
+
+# the approximate value of 2pi:
+def op_tau(st, tau=math.tau):
+  push(tau)
+
+
+# stack manipulators:
+#
+# swap x and y:
+def op_swap(st):
+  stack[0], stack[1] = stack[1], stack[0]
+
+
+# duplicate the value in x:
+def op_dup(st):
+  push(stack[0])
+
+
+# clear the contents of the stack:
+def op_clr(st):
+  stack.clear()
+  stack.extend([0.0] * stack.maxlen)
+
+
+# 'roll' the stack down one:
+def op_rd(st):
+  stack.rotate(-1)
+
+
+# 'roll' the stack up one:
+def op_ru(st):
+  stack.rotate(1)
+
+
+# miscellaneous:
+#
+# copy the sign of y to x:
+def op_cs(st, copysign=math.copysign):
+  stack[0] = copysign(stack[0], stack[1])
+
+
+# return the value of the cmd line pointer
+def op_ptr(st):
+  push(st.it_r)
+
+
+# generate a pseudo random number between 0 and 1:
+# (random.random is bound once, when the function is defined.)
+def op_rand(st, rand=random.random):
+  push(rand())
+
+
+# set the number of decimals to the following value:
+def op_fix(st):
+  st.it_r += 1
+  if st.it_r == len(st.cmd_ln):  # there's nothing after 'fix'
+    push(st.decimal_places)
+  else:
+    st.decimal_places = abs(int(st.cmd_ln[st.it_r]))
+
+
+# show the whole value of the x register:
+def op_show(st):
+  x = stack[0]
+  print(f"{YLW}{x:,}{WHT}\n")
+
+
+# store x in a named 'register':
+def op_sto(st):
+  x = stack[0]
+  st.it_r += 1
+  st.mem[st.cmd_ln[st.it_r]] = x
+  st.mem_shown = None
+
+
+# recall a value from 'memory':
+def op_rcl(st):
+  st.it_r += 1
+  name = st.cmd_ln[st.it_r]
+  val = st.mem.get(name)
+  if val is not None:
+    push(val)
+    print(f"{YLW}{name}{WHT}\n")
+  else:
+    sys.stdout.write(NOT_FOUND % ("Register", name))
+
+
+# delete a register:
+def op_del(st):
+  st.it_r += 1
+  if st.cmd_ln[st.it_r] in st.mem:
+    del st.mem[st.cmd_ln[st.it_r]]
+    st.mem_shown = None
+  else:
+    sys.stdout.write(NOT_FOUND % ("Register", st.cmd_ln[st.it_r]))
+
+
+# display the contents of the memory regsiters:
+# (the listing is only built again after the registers change.)
+def op_mem(st):
+  if st.mem_shown is None:
+    st.mem_shown = str(st.mem)[1:-1]
+  print(f"{YLW}Memory registers:")
+  print(f"{st.mem_shown}{WHT}\n")
+
+
+# display keyboard shortcuts:
+def op_scut(st):
+  if st.scut_shown is None:
+    st.scut_shown = str(kbsc)[1:-1].replace(": ", ":")
+  print(f"{YLW}Keyboard shortcuts:")
+  print(f"{st.scut_shown}{WHT}\n")
+
+
+# The user's keyboard shortcuts (kbsc) and the shift saving ones
+# (kbsc2) are folded into one table so a token only needs one lookup.
+# A shortcut can lead to a kbsc2 key, so those get followed through.
+# kbsc_rev goes the other way, so 'help' can show an operator's key.
+def merge_shortcuts():
+  """Rebuilds kbsc_all & kbsc_rev from kbsc & kbsc2."""
+  kbsc_all.clear()
+  kbsc_all.update(kbsc2)
+  kbsc_rev.clear()
+  for key, op in kbsc.items():
+    kbsc_all[key] = kbsc2.get(op, op)
+    kbsc_rev.setdefault(op, key)
+
+
+# changing the shortcuts changes what the tokens mean, so anything
+# that's already been compiled has to be done over.
+def recompile(st):
+  """Recompiles the line being run and forgets the compiled program."""
+  merge_shortcuts()
+  compile_line.cache_clear()
+  st.scut_shown = None
+  st.code = compile_program(st.cmd_ln)
+  st.prog_code = None
+
+
+# add a shortcut to the list:
+def op_scutadd(st):
+  st.it_r += 1
+  key = st.cmd_ln[st.it_r]
+  st.it_r += 1
+  kbsc[key] = st.cmd_ln[st.it_r]
+  recompile(st)
+
+
+# delete a shortcut from the list:
+def op_scutdel(st):
+  st.it_r += 1
+  key = st.cmd_ln[st.it_r]
+  if key in kbsc:
+    del kbsc[key]
+    recompile(st)
+  else:
+    sys.stdout.write(NOT_FOUND % ("Shortcut", key))
+
+
+# clear the contents of the memory registers:
+def op_clrg(st):
+  st.mem.clear()
+  st.mem_shown = None
+  print(f"{YLW}Registers cleared.{WHT}\n")
+
+
+# clear the screen of unwanted messages:
+def op_cls(st):
+  print(f"{CLS}")
+
+
+# Programming related commands
+#
+# label: only purpose is to be ignored,
+# along with the token immediately after it.
+# EXC, GSB, GTO & RTN will use labels.
+def op_lbl(st):
+  st.it_r += 1  # now points to the labels descriptor
+  # the it_r += 1 at the end will step over the label's
+  # descriptor
+
+
+# build dict of labels in the format: {name: location}
+# only done the first time a program is run after it's loaded.
+def find_labels(prog_listing):
+  """Finds where every label in the program is."""
+  x = 0
+  pdict = {}
+  while x < len(prog_listing):
+    if prog_listing[x].lower() == "lbl":
+      x += 1
+      pdict[prog_listing[x]] = x
+    x += 1
+  return pdict
+
+
+# executes the program starting at label x:
+# Things got a lot more complicated when I decided
+# to allow basic calculator style programming...
+def op_exc(st):
+  # setup a few things to allow jumping around
+  st.it_r += 1
+  prog_listing = st.prog_listing
+  if st.prog_labels is None:
+    st.prog_labels = find_labels(prog_listing)
+  pdict = st.prog_labels
+  st.pdict = pdict
+  # if the label exists replace the command line
+  # and set the pointer (it_r) to the start.
+  if st.cmd_ln[st.it_r] in pdict:
+    lbl_nam = st.cmd_ln[st.it_r]
+    st.lbl_rtn = []
+    if st.prog_code is None:
+      st.prog_code = compile_program(prog_listing)
+    st.cmd_ln = prog_listing
+    st.code = st.prog_code
+    st.running = True
+    st.it_r = pdict[lbl_nam]
+  else:
+    sys.stdout.write(NOT_FOUND % ("Label", st.cmd_ln[st.it_r]))
+
+
+# gosub routine:
+# This tosses the calling location onto the lbl_rtn
+# stack we created in 'EXC' so we'll know where to
+# return to.
+# Typed on the command line (no program running), 'gsb' and 'gto'
+# just start the program at the label, the same as 'exc'.
+def op_gsb(st):
+  if not st.running:
+    return op_exc(st)
+  st.it_r += 1
+  lbl_nam = st.cmd_ln[st.it_r]
+  if lbl_nam in st.pdict:
+    st.lbl_rtn.append(st.it_r)
+    st.it_r = st.pdict[lbl_nam]
+  else:
+    sys.stdout.write(NOT_FOUND % ("Label", lbl_nam))
+
+
+# goto routine:
+# Just like 'gsb' but no need to go back.
+def op_gto(st):
+  if not st.running:
+    return op_exc(st)
+  st.it_r += 1
+  lbl_nam = st.cmd_ln[st.it_r]
+  if lbl_nam in st.pdict:
+    st.it_r = st.pdict[lbl_nam]
+  else:
+    sys.stdout.write(NOT_FOUND % ("Label", lbl_nam))
+
+
+# return - for end of program or subroutine:
+# if called by a 'gsb' will go back to the token
+# following the 'gsb'.  Otherwise it will end the
+# program.
+def op_rtn(st):
+  if len(st.lbl_rtn):
+    st.it_r = st.lbl_rtn.pop()
+  else:
+    st.it_r = 0
+    st.cmd_ln = ["nop", "nop"]
+    st.code = compile_line(("nop", "nop"))
+    st.running = False
+
+
+# pauses a running program
+def op_pse(st):
+  input(f"\n{YLW}Press ENTER to continue.{WHT}")
+
+
+# does nothing.  Short for "No OPeration"
+def op_nop(st):
+  pass
+
+
+# tests: lots of tests. No branching, just jumping if
+# false. if true, continues execution at the the next
+# token, otherwise: skip the next two(2) tokens.
+# Every test is the same code; only the comparison (from the
+# operator module) and what x is compared to (0 or y) differ.
+def test(cmp, with_y=False):
+  """Makes a test of x against 0 (or against y)."""
+
+  def op(st):
+    if not cmp(stack[0], stack[1] if with_y else 0):
+      st.it_r += 2
+
+  return op
+
+
+# dump the program listing:
+# (put together the first time, then kept until the program is edited.)
+def op_prog(st):
+  if st.prog_shown is None:
+    listing = " ".join(st.prog_listing).replace("RTN", "RTN\n")
+    st.prog_shown = f"{YLW}Programming space:\n {listing}\n{WHT}\n"
+  sys.stdout.write(st.prog_shown)
+
+
+# edit the program data file:
+# (subprocess & shlex are only imported if 'edit' is used.)
+def op_edit(st):
+  import subprocess
+
+  before = file_stamp(prognam)
+  try:
+    if os.name == "posix":  # $EDITOR may carry its own arguments
+      import shlex
+
+      cmd = shlex.split(editor) or [default_editor]
+    else:  # a Windows path is taken as is, spaces and all
+      cmd = [editor]
+    subprocess.run(cmd + [prognam])
+  # missing, not executable, or unbalanced quotes in $EDITOR:
+  except (OSError, ValueError):
+    sys.stdout.write(NOT_FOUND % ("Editor", editor))
+    return
+  print(f"{CLS}")
+  # only reload (and recompile) if the file was actually saved:
+  if file_stamp(prognam) != before:
+    listing = program_data(prognam)  # reload
+    if listing is None:  # the file's gone; keep what we had
+      sys.stdout.write(NOT_FOUND % ("Program file", prognam))
+      return
+    st.prog_listing = listing
+    st.prog_code = None
+    st.prog_labels = None
+    st.prog_shown = None
+
+
+# print the version number:
+def op_version(st):
+  print(f"{RED}{version}{WHT}\n")
+
+
+# display help (in a convoluted fashion, but this *is*
+# an exercise in learning how to program).
+def op_help(st):
+  cmd_ln = st.cmd_ln
+  st.it_r += 1
+  if st.it_r < len(cmd_ln):
+    name = cmd_ln[st.it_r].lower()  # operators aren't case sensitive
+    if name in ["op", "o"]:  # list operators
+      sys.stdout.write(help_op_text)
+    # look up help on a particular operator:
+    elif name in op_dict:
+      key = f"({kbsc_rev[name]})" if name in kbsc_rev else ""
+      sys.stdout.write(
+        f"{YLW}{cmd_ln[st.it_r].upper()}{key}: {op_dict[name]}{WHT}\n\n"
+      )
+    else:
+      sys.stdout.write(NOT_FOUND % ("Operator", cmd_ln[st.it_r]))
+  else:  # just print the __doc__ string from the top
+    print(f"{YLW}{__doc__}{WHT}")
+
+
+# Note that the stat identifiers for the user do not match what's used
+# internally by the script. So we made a new dictionary just for the
+# user to retrieve these values: {user's name: internal name}.
+STAT_NAMES = {
+  "n": "Sn",
+  "Ex": "Sx",
+  "Ey": "Sy",
+  "Ex2": "Sx2",
+  "Ey2": "Sy2",
+  "Exy": "Sxy",
+  "x": "Mx",
+  "y": "My",
+  "ox": "SDx",
+  "oy": "SDy",
+  "r": "CCr",
+  "a": "Sa",
+  "b": "YIb",
+}
+
+
+def stat_value(st, name):
+  """The stat register or result the user calls name."""
+  key = STAT_NAMES[name]
+  if key in st.stat_regs:
+    return st.stat_regs[key]
+  return st.stats[key]
+
+
+# 2 variable statistics:
+def op_stat(st):
+  cmd_ln = st.cmd_ln
+  sr = st.stat_regs
+  Sn = sr["Sn"]
+  Sx = sr["Sx"]
+  Sy = sr["Sy"]
+  Sx2 = sr["Sx2"]
+  Sy2 = sr["Sy2"]
+  Sxy = sr["Sxy"]
+  x = stack[0]  # x & y are only looked at, not pulled
+  y = stack[1]
+
+  num = 0
+  if st.it_r + 1 == len(cmd_ln):  # blank after 'stat'?
+    num = 1  # then just make one entry
+  else:
+    st.it_r += 1  # increment to the next item in cmd_ln
+  arg = cmd_ln[st.it_r]
+  sub = arg.lower()  # the sub-commands aren't case sensitive
+  if arg.isdigit():
+    num = int(arg)
+  x2 = x * x  # the squares & product only need working out once
+  y2 = y * y
+  xy = x * y
+  if num > 0:  # the same pair num times, added in one go:
+    Sn += num  # tracks # of xy pairs
+    Sx += num * x  # sum of the x entries
+    Sy += num * y  # sum of the y entries
+    Sx2 += num * x2  # sum of the squares of the x entries
+    Sy2 += num * y2  # sum of the squares of the y entries
+    Sxy += num * xy  # sum of the product of the x & y entries
+    st.stats_dirty = True
+  if sub == "undo":
+    Sn -= 1
+    Sx -= x
+    Sy -= y
+    Sx2 -= x2
+    Sy2 -= y2
+    Sxy -= xy
+    st.stats_dirty = True
+  sr.update(Sn=Sn, Sx=Sx, Sy=Sy, Sx2=Sx2, Sy2=Sy2, Sxy=Sxy)
+  if sub == "clear":
+    sr.update(Sn=0, Sx=0, Sy=0, Sx2=0, Sy2=0, Sxy=0)
+    st.stats = dict(stat_zero)
+  elif sub == "save":  # Add the stat regs to the user regs
+    st.mem.update((name, stat_value(st, name)) for name in STAT_NAMES)
+    st.mem_shown = None
+  elif sub == "est":
+    x = pull()  # just to clear the estimate off the stack
+    stats = st.stats
+    y = stats["Sa"] * x + stats["YIb"]  # y=ax+b
+    push(y)  # put y onto the stack
+    print(f"{YLW}x: {WHT}{x}{YLW}, ~y: {WHT}{y}\n")
+  elif arg in STAT_NAMES:
+    push(stat_value(st, arg))
+  # Essentially anything after 'stat' will stop x & y from being added.
+  # Originally required 'show' to display stat data, but now you can
+  # type anything that's not a number or specified above.
+  # The lines are filled in and written out all at once.
+  out = stat_show_regs.format(**sr)
+  if sr["Sn"] > 1:  # need 2 or more data points for these
+    stats = st.stats
+    out += stat_show_means.format(**stats)
+    if sr["Sn"] > 2:  # Std Deviation appears to need at least 3 sets
+      out += stat_show_sd.format(**stats)
+    out += stat_show_fit.format(**stats)
+  sys.stdout.write(f"{out}{WHT}\n")  # blank line
+
+
+# The jump table: every operator's token and the function that
+# does the work.  Built once when the script loads.
+OPS = {
+  "+": op_add,
+  "-": op_sub,
+  "*": op_mul,
+  "/": op_div,
+  "^": op_pow,
+  "xroot": op_xroot,
+  "r>p": op_r2p,
+  "p>r": op_p2r,
+  "%": op_pct,
+  "%c": op_pctc,
+  "cnr": op_cnr,
+  "pnr": op_pnr,
+  "gcd": op_gcd,
+  "sqrt": unary(math.sqrt),  # square root of x
+  "sq": op_sq,
+  "e": unary(math.exp),  # e to the x (e^x)
+  "ln": unary(math.log),  # natural log of x
+  "tx": op_tx,
+  "log": unary(math.log10),  # base 10 log of x
+  "rcp": op_rcp,
+  "chs": op_chs,
+  "abs": unary(abs),  # absolute value of x
+  "ceil": unary(math.ceil),  # ceiling of x
+  "floor": unary(math.floor),  # floor of x
+  "!": op_fact,
+  "gamma": unary(gamma),  # gamma of x
+  "frac": op_frac,
+  "int": op_int,
+  "rnd": op_rnd,
+  "ratio": op_ratio,
+  # trigonometry operators:
+  "sin": unary(math.sin),
+  "cos": unary(math.cos),
+  "tan": unary(math.tan),
+  "asin": unary(math.asin),
+  "acos": unary(math.acos),
+  "atan": unary(math.atan),
+  "sinh": unary(math.sinh),
+  "cosh": unary(math.cosh),
+  "tanh": unary(math.tanh),
+  "asinh": unary(math.asinh),
+  "acosh": unary(math.acosh),
+  "atanh": unary(math.atanh),
+  "atan2": binary(math.atan2),  # arctangent of y/x (considers signs)
+  "hyp": binary(math.hypot),  # hypotenuse of x & y
+  # angle conversions:
+  "rad": unary(math.radians),  # degrees to radians
+  "deg": unary(math.degrees),  # radians to degrees
+  "in": op_in,
+  "cm": op_cm,
+  "gal": op_gal,
+  "ltr": op_ltr,
+  "lbs": op_lbs,
+  "kg": op_kg,
+  "c>f": op_c2f,
+  "f>c": op_f2c,
+  "dh": op_dh,
+  "hms": op_hms,
+  "pi": op_pi,
+  "tau": op_tau,
+  "swap": op_swap,
+  "dup": op_dup,
+  "clr": op_clr,
+  "rd": op_rd,
+  "ru": op_ru,
+  "cs": op_cs,
+  "ptr": op_ptr,
+  "rand": op_rand,
+  "fix": op_fix,
+  "show": op_show,
+  "sto": op_sto,
+  "rcl": op_rcl,
+  "del": op_del,
+  "mem": op_mem,
+  "scut": op_scut,
+  "scutadd": op_scutadd,
+  "scutdel": op_scutdel,
+  "clrg": op_clrg,
+  "cls": op_cls,
+  "lbl": op_lbl,
+  "exc": op_exc,
+  "gsb": op_gsb,
+  "gto": op_gto,
+  "rtn": op_rtn,
+  "pse": op_pse,
+  "nop": op_nop,
+  "x=0?": test(operator.eq),
+  "x!=0?": test(operator.ne),
+  "x>0?": test(operator.gt),
+  "x<0?": test(operator.lt),
+  "x>=0?": test(operator.ge),
+  "x<=0?": test(operator.le),
+  "x=y?": test(operator.eq, True),
+  "x!=y?": test(operator.ne, True),
+  "x>y?": test(operator.gt, True),
+  "x<y?": test(operator.lt, True),
+  "x>=y?": test(operator.ge, True),
+  "x<=y?": test(operator.le, True),
+  "prog": op_prog,
+  "edit": op_edit,
+  "version": op_version,
+  "help": op_help,
+  "stat": op_stat,
+}
+
+
+# it didn't match any operator, check to see if it's
+# a register. If not, assume it's an error.
+#
+# last chance to do something with the token.
+# note that if you name a register the same as a command
+# you'll need to use 'rcl'.
+# The name is worked out when the line is compiled, and it's the name
+# as typed: register names are case sensitive.
+def register(name):
+  """Makes an operator that recalls the register called name."""
+
+  def op(st):
+    val = st.mem.get(name)  # registers only ever hold numbers
+    if val is not None:
+      push(val)
+    #
+    # it's not recognized.
+    else:
+      sys.stdout.write(ERROR % ("Invalid Operator", name))
+
+  return op
+
+
+# Programs (and command lines) are compiled before they're run: every
+# token is lowercased, has its keyboard shortcut substituted and is then
+# either turned into a number or looked up in the jump table.  The
+# result has one (operator, token) pair per token so it lines up with
+# the original list (tests skip tokens and labels point at them).
+# Numbers get an operator that pushes them and their value as the
+# token, so running a line is nothing but calls.
+def compile_program(tokens):
+  """Resolves every token to its operator (or number) ahead of time."""
+  code = []
+  for name in tokens:
+    token = name.lower()  # is anything NaN.
+    #
+    # substitute a type shortcut for its operator.
+    token = kbsc_all.get(token, token)
+    #
+    # if it starts like a number it's a number (so 'inf' and 'nan'
+    # are still names, and '1,5' is a mistake, not a register):
+    if token[0].isdigit() or (token[0] in ".+-" and len(token) > 1):
+      try:
+        num = float(token)
+        code.append((number(num), num))
+      except ValueError:
+        code.append((not_a_number, token))
+    #
+    # otherwise it's assumed to be an operator.  Look it up in
+    # the jump table; if it's not there it's a register's name.
+    else:
+      code.append((OPS.get(token) or register(name), token))
+  return code
+
+
+# The same command lines tend to get typed over and over, so keep the
+# compiled versions of the recent ones.  Keyed on the tuple of tokens;
+# recompile() empties it when the shortcuts change.
+@functools.lru_cache(maxsize=256)
+def compile_line(tokens):
+  """compile_program() for a command line that's been seen before."""
+  return compile_program(tokens)
 
 
 # This is the guts of the whole thing...
 def calc(stack, mem, prog_listing, decimal_places, stat_regs):
   """Processes all input."""
-  # statistical variables:
-  Sn = stat_regs["Sn"]
-  Sx = stat_regs["Sx"]
-  Sy = stat_regs["Sy"]
-  Sx2 = stat_regs["Sx2"]
-  Sy2 = stat_regs["Sy2"]
-  Sxy = stat_regs["Sxy"]
-  if Sn > 1 and Sn * Sx2 != Sx ** 2 and Sn * Sy2 != Sy ** 2:
-    Mx = Sx / Sn  # mean of x
-    My = Sy / Sn  # mean of y
-    SDx = math.sqrt((Sn * Sx2 - Sx ** 2) / (Sn * (Sn - 1)))
-    SDy = math.sqrt((Sn * Sy2 - Sy ** 2) / (Sn * (Sn - 1)))
-    # correlation coefficent(r):
-    CCr = (Sn * Sxy - Sx * Sy) / math.sqrt(
-      (Sn * Sx2 - Sx ** 2) * (Sn * Sy2 - Sy ** 2)
-    )
-    Sa = (Sn * Sxy - Sx * Sy) / (Sn * Sx2 - Sx ** 2)  # slope(a):
-    YIb = Sy / Sn - Sa * Sx / Sn  # y intercept(b):
-  else:
-    Mx = My = SDx = SDy = CCr = Sa = YIb = 0
-
-  incr = True  # in case you want to stop the pointer (it_r) from incrementing
+  st = State(mem, prog_listing, decimal_places, stat_regs)
 
   print(f"{CLS}{YLW}Type 'help' for documentation.")
   print(f"Type 'help op' for a list of available operators.")
   print(f"Type 'help <operator>' (without braces) for specifics on an operator.")
   print(f"Type 'scut' for a list of keyboard shortcuts.{WHT}\n")
 
+  reg = ["x:", "y:", "z:", "t:"]  # our stack labels
+  fmt_dp = None  # the decimal places 'fmt' was made for
+  shown = []  # (value, formatted value) last displayed for each register
+
   while True:  # loop endlessly until a break statement
 
-    it_r = 0  # token iterator
+    st.it_r = 0  # token iterator
 
-    # Display the stack and prompt for input:
-    reg = ["x:", "y:", "z:", "t:"]  # our stack labels
-    i = len(reg) - 1  # index of the last label
-    while i:  # prints out 'y', 'z' and 't'
-      print(f"{YLW}{reg[i]}{WHT} {stack[i]:,.{decimal_places}f}")
-      i -= 1
+    # Display the stack and prompt for input.  A register only gets
+    # formatted again if it holds a different value (or 'fix' was
+    # changed) since the last time it was displayed.
+    if fmt_dp != st.decimal_places:
+      fmt_dp = st.decimal_places
+      fmt = f"{{:,.{fmt_dp}f}}".format
+      shown = [(None, "")] * len(reg)
+    for i in range(len(reg)):
+      if shown[i][0] is not stack[i]:
+        shown[i] = (stack[i], fmt(stack[i]))
+    # 't', 'z' and 'y' go out in a single write:
+    sys.stdout.write(
+      "".join(
+        f"{YLW}{reg[i]}{WHT} {shown[i][1]}\n"
+        for i in range(len(reg) - 1, 0, -1)
+      )
+    )
     # Now display x and prompt for the command line:
     # note: cmd_ln is the input line as a Python list.
-    cmd_ln = input(f"{RED}{reg[0]}{WHT} {stack[0]:,.{decimal_places}f} ").split()
+    st.cmd_ln = input(f"{RED}{reg[0]}{WHT} {shown[0][1]} ").split()
+    st.running = False
+    st.code = compile_line(tuple(st.cmd_ln))
 
     # clear the screen; probably shouldn't be here.
     # this works in linux on my chromebook.
@@ -358,855 +1432,89 @@ def calc(stack, mem, prog_listing, decimal_places, stat_regs):
       print(f"{CLS}")  # clear the screen.
 
     try:
-      if cmd_ln[it_r].lower() in ["quit", "exit", "close"]:
-        fh = open(memnam, "w", encoding="utf-8")
-        fh.write(f"{stack}\n{mem}\n{decimal_places}\n{kbsc}\n")
-        stat_regs["Sn"] = Sn
-        stat_regs["Sx"] = Sx
-        stat_regs["Sy"] = Sy
-        stat_regs["Sx2"] = Sx2
-        stat_regs["Sy2"] = Sy2
-        stat_regs["Sxy"] = Sxy
-        fh.write(f"{stat_regs}")
-        fh.close()
+      if st.cmd_ln[st.it_r].lower() in ["quit", "exit", "close"]:
+        # saved in one piece, and only if something's changed.
+        saving = json.dumps(
+          {
+            "stack": list(stack),
+            "mem": st.mem,
+            "decimal_places": st.decimal_places,
+            "kbsc": kbsc,
+            "stat_regs": st.stat_regs,
+          },
+          indent=2,
+        )
+        # (or if the file was deleted while we were running.)
+        if saving != memtxt or not os.path.exists(memnam):
+          with open(memnam, "w", encoding="utf-8") as fh:
+            fh.write(saving)
         break
     except IndexError:  # just pressing ENTER is the same as 'dup'
-      x = pull()
-      push(x)
-      push(x)
+      push(stack[0])
 
     # Execute the command line
     #
-    while it_r < len(cmd_ln):
+    # The try is set up once for the whole line (or program); the
+    # outer loop only comes round again to carry on after an error
+    # that doesn't stop the line.
+    while st.it_r < len(st.code):
       try:
-        # make the space delimited string object a token:
-        token = cmd_ln[it_r].lower()  # is anything NaN.
-        #
-        # substitute a type shortcut for its operator.
-        if token in kbsc.keys():
-          token = kbsc[token]
-        if token in kbsc2.keys():  # shift not needed.
-          token = kbsc2[token]
-        #
-        # convoluted way to figure out if the token is a number:
-        if token[0].isdigit() or (token[0] in ".+-" and len(token) > 1):
-          push(token)
-        #
-        # if it doesn't satisfy the above criteria for being a number
-        # it's assumed to be an operator.
-        #
-        # binary operators:
-        #
-        # addition:
-        elif token == "+":
-          x = pull()
-          y = pull()
-          push(x + y)
-        #
-        # subtraction:
-        elif token == "-":
-          x = pull()
-          y = pull()
-          push(y - x)
-        #
-        # multiplication:
-        elif token == "*":
-          x = pull()
-          y = pull()
-          push(x * y)
-        #
-        # division:
-        elif token == "/":
-          x = pull()
-          y = pull()
-          push(y / x)
-        #
-        # raise y to the x:
-        elif token == "^":
-          x = pull()
-          y = pull()
-          push(y ** x)
-        #
-        # x root of y:
-        elif token == "xroot":
-          x = pull()
-          y = pull()
-          push(y ** (1 / x))
-        #
-        # rectangular to polar conversion:
-        elif token == "r>p":
-          x = pull()
-          y = pull()
-          push(math.atan2(y, x))  # angle
-          push(math.hypot(x, y))  # magnitude
-          print(
-            f"{YLW}Angle(y): {WHT}{math.atan2(y,x):.4f}{YLW};"
-            + f" Magnitude(x): {WHT}{math.hypot(x,y):.4f}\n"
-          )
-        #
-        # polar to rectangular conversion:
-        elif token == "p>r":
-          x = pull()  # magnitude
-          y = pull()  # angle
-          push(x * math.sin(y))  # y
-          push(x * math.cos(y))  # x
-        #
-        # x percent of y (leaves y in the stack):
-        elif token == "%":
-          x = pull()
-          y = pull()
-          push(y)
-          push((x / 100) * y)
-        #
-        # percentage change from y to x (leaves y in the stack):
-        elif token == "%c":
-          x = pull()
-          y = pull()
-          push(y)
-          push((x / y - 1) * 100)
-        #
-        # combinations of x into y:
-        elif token == "cnr":
-          x = int(pull())  # forced int here to prevent push line from
-          y = int(pull())  # from getting too long.
-          push(
-            math.factorial(y) / (math.factorial(x) * math.factorial(y - x))
-          )
-        #
-        # permutations of x in y:
-        elif token == "pnr":
-          x = int(pull())  # see "cnr" above
-          y = int(pull())
-          push(math.factorial(y) / math.factorial(y - x))
-        #
-        # greatest common divisor of x & y:
-        elif token == "gcd":
-          x = pull()
-          y = pull()
-          push(math.gcd(int(x), int(y)))  # different method forcing ints
-        #
-        # unary operators:
-        #
-        # square root of x:
-        elif token == "sqrt":
-          x = pull()
-          push(math.sqrt(x))
-        #
-        # square of x:`
-        elif token == "sq":
-          x = pull()
-          push(x ** 2)
-        #
-        # e to the x (e^x):
-        elif token == "e":
-          x = pull()
-          push(math.exp(x))
-        #
-        # natural log of x:
-        elif token == "ln":
-          x = pull()
-          push(math.log(x))
-        #
-        # Base of 10 raised to x:
-        elif token == "tx":
-          x = pull()
-          push(10 ** x)
-        #
-        # base 10 log of x:
-        elif token == "log":
-          x = pull()
-          push(math.log10(x))
-        #
-        # reciprocal of x (1/x):
-        elif token == "rcp":
-          x = pull()
-          push(1 / x)
-        #
-        # change sign of x:
-        elif token == "chs":
-          x = pull()
-          push(x * -1)
-        #
-        # absolute value of x:
-        elif token == "abs":
-          x = pull()
-          push(math.fabs(x))
-        #
-        # ceiling of x:
-        elif token == "ceil":
-          x = pull()
-          push(math.ceil(x))
-        #
-        # floor of x:
-        elif token == "floor":
-          x = pull()
-          push(math.floor(x))
-        #
-        # factorial of x:
-        elif token == "!":
-          x = pull()
-          push(math.factorial(int(x)))
-        #
-        # gamma of x:
-        elif token == "gamma":
-          x = pull()
-          push(math.gamma(x))
-        #
-        # fractional portion of x:
-        elif token == "frac":
-          x = pull()
-          push(math.modf(x)[0])
-        #
-        # integer portion of x:
-        elif token == "int":
-          x = pull()
-          push(math.modf(x)[1])
-        #
-        # round a number to the display value
-        elif token == "rnd":
-          x = pull()
-          push(round(x, decimal_places))
-        #
-        # convert a float into a ratio (y/x):
-        elif token == "ratio":
-          x = pull()
-          push(x.as_integer_ratio()[0])
-          push(x.as_integer_ratio()[1])
-        #
-        # trigonometry operators:
-        #
-        elif token == "sin":
-          x = pull()
-          push(math.sin(x))
-        elif token == "cos":
-          x = pull()
-          push(math.cos(x))
-        elif token == "tan":
-          x = pull()
-          push(math.tan(x))
-        elif token == "asin":
-          x = pull()
-          push(math.asin(x))
-        elif token == "acos":
-          x = pull()
-          push(math.acos(x))
-        elif token == "atan":
-          x = pull()
-          push(math.atan(x))
-        elif token == "sinh":
-          x = pull()
-          push(math.sinh(x))
-        elif token == "cosh":
-          x = pull()
-          push(math.cosh(x))
-        elif token == "tanh":
-          x = pull()
-          push(math.tanh(x))
-        elif token == "asinh":
-          x = pull()
-          push(math.asinh(x))
-        elif token == "acosh":
-          x = pull()
-          push(math.acosh(x))
-        elif token == "atanh":
-          x = pull()
-          push(math.atanh(x))
-        elif token == "atan2":  # arctangent of y/x (considers signs of x & y):
-          x = pull()
-          y = pull()
-          push(math.atan2(y, x))
-        elif token == "hyp":  # hypotenuse of x & y:
-          x = pull()
-          y = pull()
-          push(math.hypot(x, y))
-        #
-        # angle conversions:
-        #
-        # convert angle in degrees to radians:
-        elif token == "rad":
-          x = pull()
-          push(math.radians(x))
-        #
-        # convert angle in radians to degrees:
-        elif token == "deg":
-          x = pull()
-          push(math.degrees(x))
-        #
-        # metric/imperial conversions:
-        #
-        # convert length in centimeters to inches:
-        elif token == "in":
-          x = pull()
-          push(x / 2.54)
-        #
-        # convert length in inches to centimeters:
-        elif token == "cm":
-          x = pull()
-          push(x * 2.54)
-        #
-        # convert volume in litres to gallons:
-        elif token == "gal":
-          x = pull()
-          push((((x * 1000) ** (1 / 3) / 2.54) ** 3) / 231)
-        #
-        # convert volume in gallons to litres:
-        elif token == "ltr":
-          x = pull()
-          push(x * 231 * 2.54 ** 3 / 1000)
-        #
-        # convert weight in kilograms to lbs.:
-        elif token == "lbs":
-          x = pull()
-          push(x * 2.204622622)
-        #
-        # convert weight in lbs. to kilograms:
-        elif token == "kg":
-          x = pull()
-          push(x / 2.204622622)
-        #
-        # convert temperature from celsius to fahrenheit:
-        elif token == "c>f":
-          x = pull()
-          push(x * 9 / 5 + 32)
-        #
-        # convert temperature from celsius to fahrenheit:
-        elif token == "f>c":
-          x = pull()
-          push((x - 32) * 5 / 9)
-        #
-        # convert h.mmss to a decimal value:
-        elif token == "dh":
-          x = pull()
-          h = int(x)
-          m = int((x - h) * 100)
-          s = round((x - h - (m / 100)) * 10000, 4)
-          print(f"{YLW}{h}h:{m}m:{s}s{WHT}\n")
-          push(h + (m / 60) + (s / (60 ** 2)))
-        #
-        # convert decimal time value to h.mmss:
-        elif token == "hms":
-          x = pull()
-          h = int(x)
-          m = int((x * 60) % 60)
-          s = round((x * 3600) % 60, 4)
-          print(f"{YLW}{h}h:{m}m:{s}s{WHT}\n")
-          push(h + m / 100 + s / 10000)
-        #
-        # constant(s):
-        #
-        # the approximate value of pi:
-        elif token == "pi":
-          push(math.pi)
-        #
-        # the approximate value of 2pi:
-        elif token == "tau":
-          push(math.tau)
-        #
-        # stack manipulators:
-        #
-        # swap x and y:
-        elif token == "swap":
-          x = pull()
-          y = pull()
-          push(x)
-          push(y)
-        #
-        # duplicate the value in x:
-        elif token == "dup":
-          x = pull()
-          push(x)
-          push(x)
-        #
-        # clear the contents of the stack:
-        elif token == "clr":
-          i = len(stack)
-          while i:
-            push(0.0)
-            i -= 1
-        #
-        # 'roll' the stack down one:
-        elif token == "rd":
-          i = 0
-          t = stack[0]
-          while i < len(stack) - 1:
-            stack[i] = stack[i + 1]
-            i += 1
-          stack[i] = t
-        #
-        # 'roll' the stack up one:
-        elif token == "ru":
-          i = len(stack) - 1
-          t = stack[i]
-          while i:
-            stack[i] = stack[i - 1]
-            i -= 1
-          stack[i] = t
-        #
-        # miscellaneous:
-        #
-        # copy the sign of y to x:
-        elif token == "cs":
-          x = pull()
-          y = pull()
-          push(y)
-          push(math.copysign(x, y))
-        #
-        # return the value of the cmd line pointer
-        elif token == "ptr":
-          push(it_r)
-        #
-        # generate a pseudo random number between 0 and 1:
-        elif token == "rand":
-          push(random.random())
-        #
-        # set the number of decimals to the following value:
-        elif token == "fix":
-          it_r += 1
-          if it_r == len(cmd_ln):  # there's nothing after 'fix'
-            push(decimal_places)
-          else:
-            decimal_places = abs(int(cmd_ln[it_r]))
-        #
-        # show the whole value of the x register:
-        elif token == "show":
-          x = pull()
-          push(x)
-          print(f"{YLW}{x:,}{WHT}\n")
-        #
-        # store x in a named 'register':
-        elif token == "sto":
-          x = pull()
-          push(x)
-          it_r += 1
-          mem[cmd_ln[it_r]] = x
-        #
-        # recall a value from 'memory':
-        elif token == "rcl":
-          it_r += 1
-          if cmd_ln[it_r] in mem.keys():
-            push(mem[cmd_ln[it_r]])
-            print(f"{YLW}{cmd_ln[it_r]}{WHT}\n")
-          else:
-            print(
-              f"{RED}Register {WHT}{cmd_ln[it_r]}{RED} not found.{WHT}\n"
-            )
-        #
-        # delete a register:
-        elif token == "del":
-          it_r += 1
-          if cmd_ln[it_r] in mem.keys():
-            del mem[cmd_ln[it_r]]
-          else:
-            print(
-              f"{RED}Register {WHT}{cmd_ln[it_r]}{RED} not found.{WHT}\n"
-            )
-        #
-        # display the contents of the memory regsiters:
-        elif token == "mem":
-          print(f"{YLW}Memory registers:")
-          print(f"{str(mem)[1:-1]}{WHT}\n")
-        #
-        # display keyboard shortcuts:
-        elif token == "scut":
-          print(f"{YLW}Keyboard shortcuts:")
-          print(f'{str(kbsc)[1:-1].replace(": ",":")}{WHT}\n')
-        #
-        # add a shortcut to the list:
-        elif token == "scutadd":
-          it_r += 1
-          key = cmd_ln[it_r]
-          it_r += 1
-          kbsc[key] = cmd_ln[it_r]
-        #
-        # delete a shortcut from the list:
-        elif token == "scutdel":
-          it_r += 1
-          key = cmd_ln[it_r]
-          if key in kbsc:
-            del kbsc[key]
-          else:
-            print(f"{RED}Shortcut {WHT}{key}{RED} not found.{WHT}\n")
-        #
-        # clear the contents of the memory registers:
-        elif token == "clrg":
-          mem.clear()
-          print(f"{YLW}Registers cleared.{WHT}\n")
-        #
-        # clear the screen of unwanted messages:
-        elif token == "cls":
-          print(f"{CLS}")
-        #
-        # Programming related commands
-        #
-        # label: only purpose is to be ignored,
-        # along with the token immediately after it.
-        # EXC, GSB, GTO & RTN will use labels.
-        elif token == "lbl":
-          it_r += 1  # now points to the labels descriptor
-          # the it_r += 1 at the end will step over the label's
-          # descriptor
-        #
-        # executes the program starting at label x:
-        # Things got a lot more complicated when I decided
-        # to allow basic calculator style programming...
-        elif token == "exc":
-          # setup a few things to allow jumping around
-          it_r += 1
-          x = 0
-          pdict = {}
-          # build dict of labels in the format: {name: location}
-          while x < len(prog_listing):
-            if prog_listing[x].lower() == "lbl":
-              x += 1
-              pdict[prog_listing[x]] = x
-            x += 1
-          # if the label exists replace the command line
-          # and set the pointer (it_r) to the start.
-          if cmd_ln[it_r] in pdict:
-            lbl_nam = cmd_ln[it_r]
-            lbl_rtn = []
-            cmd_ln = prog_listing
-            it_r = pdict[lbl_nam]
-          else:
-            print(f"{RED}Label {WHT}{cmd_ln[it_r]}{RED} not found.{WHT}\n")
-        #
-        # gosub routine:
-        # This tosses the calling location onto the lbl_rtn
-        # stack we created in 'EXC' so we'll know where to
-        # return to.
-        elif token == "gsb":
-          it_r += 1
-          lbl_rtn.append(it_r)
-          it_r = pdict[cmd_ln[it_r]]
-        #
-        # goto routine:
-        # Just like 'gsb' but no need to go back.
-        elif token == "gto":
-          it_r += 1
-          it_r = pdict[cmd_ln[it_r]]
-        #
-        # return - for end of program or subroutine:
-        # if called by a 'gsb' will go back to the token
-        # following the 'gsb'.  Otherwise it will end the
-        # program.
-        elif token == "rtn":
-          if len(lbl_rtn):
-            it_r = lbl_rtn.pop()
-          else:
-            it_r = 0
-            cmd_ln = ["nop", "nop"]
-        #
-        # pauses a running program
-        elif token == "pse":
-          input(f"\n{YLW}Press ENTER to continue.{WHT}")
-        #
-        # does nothing.  Short for "No OPeration"
-        elif token == "nop":
-          pass
-        #
-        # tests: lots of tests. No branching, just jumping if
-        # false. if true, continues execution at the the next
-        # token, otherwise: skip the next two(2) tokens.
-        #
-        # test if x is equal to 0:
-        elif token == "x=0?":
-          x = pull()
-          push(x)
-          if x:  # same as "if not x=0"
-            it_r += 2
-        #
-        # test if x in not equal to 0:
-        elif token == "x!=0?":
-          x = pull()
-          push(x)
-          if not x:
-            it_r += 2
-        #
-        # test if x is greater than 0:
-        elif token == "x>0?":
-          x = pull()
-          push(x)
-          if not x > 0:
-            it_r += 2
-        #
-        # test if x is less than 0:
-        elif token == "x<0?":
-          x = pull()
-          push(x)
-          if not x < 0:
-            it_r += 2
-        #
-        # test if x is greater than or equal to 0:
-        elif token == "x>=0?":
-          x = pull()
-          push(x)
-          if not x >= 0:
-            it_r += 2
-        #
-        # test if x is less than or equal to 0:
-        elif token == "x<=0?":
-          x = pull()
-          push()
-          if not x <= 0:
-            it_r += 2
-        #
-        # test if x is equal to y:
-        elif token == "x=y?":
-          x = pull()
-          y = pull()
-          push(y)
-          push(x)
-          if x != y:
-            it_r += 2
-        #
-        # test if x is NOT equal to y:
-        elif token == "x!=y?":
-          x = pull()
-          y = pull()
-          push(y)
-          push(x)
-          if x == y:
-            it_r += 2
-        #
-        # test if x is greater than y:
-        elif token == "x>y?":
-          x = pull()
-          y = pull()
-          push(y)
-          push(x)
-          if not x > y:
-            it_r += 2
-        #
-        # test if x is less than y:
-        elif token == "x<y?":
-          x = pull()
-          y = pull()
-          push(y)
-          push(x)
-          if not x < y:
-            it_r += 2
-        #
-        # test if x is greater than or equal to y:
-        elif token == "x>=y?":
-          x = pull()
-          y = pull()
-          push(y)
-          push(x)
-          if not x >= y:
-            it_r += 2
-        #
-        # test if x is less than or equal to y:
-        elif token == "x<=y?":
-          x = pull()
-          y = pull()
-          push(y)
-          push(x)
-          if not x <= y:
-            it_r += 2
-        #
-        # dump the program listing:
-        elif token == "prog":
-          print(f"{YLW}Programming space:\n ", end="")
-          print(f" ".join(i for i in prog_listing).replace("RTN", "RTN\n"))
-          print(f"{WHT}")
-        #
-        # edit the program data file:
-        elif token == "edit":
-          if os.name == "posix":
-            os.system(
-              "vim {}".format(os.path.splitext(__file__)[0] + ".txt")
-            )
-            prog_listing = program_data(prognam)  # reload
-            print(f"{CLS}")
-        #
-        # print the version number:
-        elif token == "version":
-          print(f"{RED}{version}{WHT}\n")
-        #
-        # display help (in a convoluted fashion, but this *is*
-        # an exercise in learning how to program).
-        elif token == "help":
-          it_r += 1
-          if it_r < len(cmd_ln):
-            if cmd_ln[it_r].lower() in ["op", "o"]:  # list operators
-              s = str(op_dict.keys())[11:-2]
-              s = s.replace("'", "")
-              s = s.replace(",", "")
-              s = s.upper()
-              s = s.split()
-              s.sort()
-              print(
-                f"{YLW}Type 'help xxx' for specific help on an operator."
-              )
-              print(f"Available operators are:")
-              for x in s:
-                print(f"'{x}'", end=" ")
-              print(f"\nOperators are not case sensitive.")
-              print(f"Shortcut key shows in parentheses.{WHT}\n")
-            # look up help on a particular operator:
-            elif cmd_ln[it_r].lower() in op_dict:
-              print(f"{YLW}{cmd_ln[it_r].upper()}", end="")
-              if cmd_ln[it_r].lower() in kbsc.values():
-                # confusing way to sort a dictionary for printing.
-                print(
-                  f"({list(kbsc.keys())[list(kbsc.values()).index(cmd_ln[it_r].lower())]})",
-                  end="",
-                )
-              print(f": {str(op_dict[cmd_ln[it_r].lower()])}{WHT}\n")
-            else:
-              print(
-                f"{RED}Operator {WHT}{cmd_ln[it_r]}{RED} not found.{WHT}\n"
-              )
-          else:  # just print the __doc__ string from the top
-            print(f"{YLW}{__doc__}{WHT}")
-        #
-        #
-        # 2 variable statistics:
-        elif token == "stat":
-          x = pull()
-          y = pull()
-          push(y)  # put the stack back the way you found it
-          push(x)
-          # Note that the stat identifiers for the user do not match what's used
-          # internally by the script. So we made a new dictionary just for the
-          # user to retrieve these values.
-          stat_dict = {
-            "n": Sn,
-            "Ex": Sx,
-            "Ey": Sy,
-            "Ex2": Sx2,
-            "Ey2": Sy2,
-            "Exy": Sxy,
-            "x": Mx,
-            "y": My,
-            "ox": SDx,
-            "oy": SDy,
-            "r": CCr,
-            "a": Sa,
-            "b": YIb,
-          }
-
-          num = 0
-          if it_r + 1 == len(cmd_ln):  # blank after 'stat'?
-            num = 1  # then just make one entry
-          else:
-            it_r += 1  # increment to the next item in cmd_ln
-          if cmd_ln[it_r].isdigit():
-            num = int(cmd_ln[it_r])
-          if num > 0:
-            i = 0
-            while i < num:  # All the statistical variables we need
-              Sn += 1  # incr it_r - tracks # of xy pairs
-              Sx += x  # sum of the x entries
-              Sy += y  # sum of the y entries
-              Sx2 += x ** 2  # sum of the squares of the x entries
-              Sy2 += y ** 2  # sum of the squares of the y entries
-              Sxy += x * y  # sum of the product of the x & y entries
-              i += 1
-          if cmd_ln[it_r].lower() == "undo":
-            Sn -= 1
-            Sx -= x
-            Sy -= y
-            Sx2 -= x ** 2
-            Sy2 -= y ** 2
-            Sxy -= x * y
-          if Sn > 1 and Sn * Sx2 != Sx ** 2 and Sn * Sy2 != Sy ** 2:
-            Mx = Sx / Sn  # mean of x
-            My = Sy / Sn  # mean of y
-            # ox = sqrt((n*Ex^2-(Ex)^2)/(n*(n-1))) std deviation of x
-            SDx = math.sqrt((Sn * Sx2 - Sx ** 2) / (Sn * (Sn - 1)))
-            # oy = sqrt((n*Ey^2-(Ey)^2)/(n*(n-1))) std deviation of y
-            SDy = math.sqrt((Sn * Sy2 - Sy ** 2) / (Sn * (Sn - 1)))
-            # correlation coefficent(r):
-            CCr = (Sn * Sxy - Sx * Sy) / math.sqrt(
-              (Sn * Sx2 - Sx ** 2) * (Sn * Sy2 - Sy ** 2)
-            )
-            Sa = (Sn * Sxy - Sx * Sy) / (Sn * Sx2 - Sx ** 2)  # slope(a):
-            YIb = Sy / Sn - Sa * Sx / Sn  # y intercept(b):
-          if cmd_ln[it_r].lower() == "clear":
-            Sn = (
-              Sx
-            ) = (
-              Sy
-            ) = Sx2 = Sy2 = Sxy = Mx = My = SDx = SDy = CCr = Sa = YIb = 0
-          elif (
-            cmd_ln[it_r].lower() == "save"
-          ):  # Add the stat regs to the user regs
-            mem.update(stat_dict)
-          # mem = mem | stat_dict # << I think this method requires Python 3.9.
+        while st.it_r < len(st.code):
+          # the line was compiled up front: op is the operator's function
+          # (or a number's push) and token is its name (or value).
+          op, token = st.code[st.it_r]
+          op(st)
           #
-          elif cmd_ln[it_r].lower() == "est":
-            x = pull()  # just to clear the estimate off the stack
-            push(Sa * x + YIb)  # y=ax+b; put y onto the stack
-            print(f"{YLW}x: {WHT}{x}{YLW}, ~y: {WHT}{Sa * x + YIb}\n")
-          elif cmd_ln[it_r] in stat_dict.keys():
-            push(stat_dict[cmd_ln[it_r]])
-          # Essentially anything after 'stat' will stop x & y from being added.
-          # Originally required 'show' to display stat data, but now you can
-          # type anything that's not a number or specified above.
-          print(f"{YLW}n:   {WHT}{Sn:.0f}")
-          print(f"{YLW}{SIG}x:  {WHT}{Sx:.4f}")
-          print(f"{YLW}{SIG}y:  {WHT}{Sy:.4f}")
-          print(f"{YLW}{SIG}x{SS2}: {WHT}{Sx2:.4f}")
-          print(f"{YLW}{SIG}y{SS2}: {WHT}{Sy2:.4f}")
-          print(f"{YLW}{SIG}xy: {WHT}{Sxy:.4f}")
-          if Sn > 1:  # need 2 or more data points for these
-            print(f"{YLW}x{OVR}:   {WHT}{Mx:.4f}")
-            print(f"{YLW}y{OVR}:   {WHT}{My:.4f}")
-            if Sn > 2:  # Std Deviation appears to need at least 3 sets
-              print(f"{YLW}{LSG}x:  {WHT}{SDx:.4f}")
-              print(f"{YLW}{LSG}y:  {WHT}{SDy:.4f}")
-            print(f"{YLW}r:   {WHT}{CCr:.4f}")
-            print(f"{YLW}a:   {WHT}{Sa:.4f}")
-            print(f"{YLW}b:   {WHT}{YIb:.4f}")
-          print(f"{WHT}")  # blank line
-        #
-        # it didn't match any token above, check to see if it's
-        # a register. If not, assume it's an error.
-        #
-        # last chance to do something with the token.
-        # note that if you name a register the same as a command
-        # you'll need to use 'rcl'.
-        elif token in mem.keys():
-          push(mem[cmd_ln[it_r]])
-        #
-        # it's not recognized.
-        else:
-          print(f"{RED}Invalid Operator: {WHT}{token}\n")
-        #
-        # increment the command line pointer to the next token
-        # and go back through this loop:
-        if incr == True:
-          it_r += 1
-        incr = True
+          # increment the command line pointer to the next token
+          # and go back through this loop:
+          if st.incr:
+            st.it_r += 1
+          else:
+            st.incr = True
 
       # exception list
       except ValueError:
-        print(f"{RED}Value error: {WHT}{token}\n")
+        sys.stdout.write(ERROR % ("Value error", token))
         break
       except ZeroDivisionError:
-        print(f"{RED}Division by zero error: {WHT}{token}\n")
+        sys.stdout.write(ERROR % ("Division by zero error", token))
         break
       except OverflowError:
-        print(f"{RED}Overflow error: {WHT}{token}\n")
+        sys.stdout.write(ERROR % ("Overflow error", token))
         break
       except IndexError:
-        print(f"{RED}Index Error: {WHT}{token}\n")
+        sys.stdout.write(ERROR % ("Index Error", token))
       except KeyError:
-        print(f"{RED}Key Error: {WHT}{token}\n")
-  # end of the very long looping function calc()
+        sys.stdout.write(ERROR % ("Key Error", token))
+  # end of calc()
 
 
 # This part initializes/recalls everything now
 # if the mem file exists use it instead of initstack()
+# The mem file is a JSON document.  Older versions wrote one Python
+# literal per line (stack, mem, decimal places, kbsc, stat_regs), so
+# if it isn't JSON read it that way; it gets saved as JSON on exit.
+memtxt = None  # the mem file as it was read
 if os.path.exists(memnam):
-  fh = open(memnam, "r", encoding="utf-8")
-  stack = ast.literal_eval(fh.readline())  # a list of floats
-  mem = ast.literal_eval(fh.readline())  # dictionary of memory registers
-  decimal_places = int(ast.literal_eval(fh.readline()))  # single int
-  kbsc = ast.literal_eval(fh.readline())  # dictionary of keyboard shortcuts
-  stat_regs = ast.literal_eval(fh.readline())  # statistical registers
-  fh.close()
+  with open(memnam, "r", encoding="utf-8") as fh:
+    memtxt = fh.read()
+  try:
+    saved = json.loads(memtxt)
+  except ValueError:
+    import ast  # only needed for the old format
+
+    saved = dict(
+      zip(
+        ("stack", "mem", "decimal_places", "kbsc", "stat_regs"),
+        map(ast.literal_eval, memtxt.splitlines()),
+      )
+    )
+  stack = saved["stack"]  # a list of floats
+  stack = deque(stack, maxlen=len(stack))
+  mem = saved["mem"]  # dictionary of memory registers
+  decimal_places = int(saved["decimal_places"])  # single int
+  kbsc = saved["kbsc"]  # dictionary of keyboard shortcuts
+  stat_regs = saved["stat_regs"]  # statistical registers
 else:  # no mem file? Just create everything from scratch
   stack = initstack(stack_size)
   mem = {}
@@ -1242,6 +1550,9 @@ else:  # no mem file? Just create everything from scratch
   }
   stat_regs = {"Sn": 0, "Sx": 0, "Sy": 0, "Sx2": 0, "Sy2": 0, "Sxy": 0}
 
+# one lookup table for all of the shortcuts:
+merge_shortcuts()
+
 # if a program file exists dump its contents into memory.
 # we'll 'import' its contents into memory whether we use it or not
 if os.path.exists(prognam):
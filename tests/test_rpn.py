@@ -0,0 +1,119 @@
+"""Drives rpn.py with piped input against a throwaway .mem and program file."""
+
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+
+import pytest
+
+RPN = os.path.join(os.path.dirname(os.path.dirname(__file__)), "rpn.py")
+
+# the old .mem format: one Python literal per line.
+LEGACY_MEM = """[30.0, 11.0, 31.0, 11.0]
+{'G': 6.674e-11, 'c': 299792458.0}
+2
+{'a': '+', 'r': 'sqrt'}
+{'Sn': 2, 'Sx': 3.0, 'Sy': 6.0, 'Sx2': 5.0, 'Sy2': 20.0, 'Sxy': 10.0}
+"""
+
+
+def run(tmp_path, *lines, mem=None, prog=None, env=None):
+  """Runs the calculator in tmp_path; returns its output and saved .mem."""
+  tmp_path.mkdir(exist_ok=True)
+  shutil.copy(RPN, tmp_path / "rpn.py")
+  if mem is not None:
+    (tmp_path / "rpn.mem").write_text(mem)
+  if prog is not None:
+    (tmp_path / "rpn.txt").write_text(prog)
+  proc = subprocess.run(
+    [sys.executable, "rpn.py"],
+    cwd=tmp_path,
+    input="\n".join(lines + ("quit",)) + "\n",
+    capture_output=True,
+    text=True,
+    timeout=30,
+    env=dict(os.environ, **(env or {})),
+  )
+  assert proc.returncode == 0, proc.stderr
+  saved = json.loads((tmp_path / "rpn.mem").read_text())
+  return proc.stdout, saved
+
+
+def test_x_le_0_runs_or_skips_the_next_2_tokens(tmp_path):
+  _, saved = run(tmp_path / "true", "0 x<=0? 5 6")
+  assert saved["stack"][:3] == [6.0, 5.0, 0.0]
+  _, saved = run(tmp_path / "false", "1 x<=0? 7 8 9")
+  assert saved["stack"][:2] == [9.0, 1.0]
+
+
+def test_dh_and_hms(tmp_path):
+  out, saved = run(tmp_path, "1.3045 dh 1.5125 hms")
+  assert "1h:30m:45.0s" in out
+  assert saved["stack"][:2] == pytest.approx([1.3045, 1.5125])
+
+
+def test_negative_time_shows_its_sign_on_the_hours(tmp_path):
+  out, saved = run(tmp_path, "-1.5 hms")
+  assert "-1h:30m:0.0s" in out
+  assert saved["stack"][0] == pytest.approx(-1.3)
+
+
+def test_cnr_and_pnr_are_0_when_x_is_more_than_y(tmp_path):
+  _, saved = run(tmp_path, "3 5 cnr 3 5 pnr")
+  assert saved["stack"][:2] == [0.0, 0.0]
+
+
+def test_legacy_mem_file_is_read_and_saved_as_json(tmp_path):
+  _, saved = run(tmp_path, "c", mem=LEGACY_MEM)
+  assert saved["stack"] == [299792458.0, 30.0, 11.0, 31.0]
+  assert saved["mem"] == {"G": 6.674e-11, "c": 299792458.0}
+  assert saved["decimal_places"] == 2
+  assert saved["kbsc"] == {"a": "+", "r": "sqrt"}
+  assert saved["stat_regs"]["Sn"] == 2
+
+
+def test_scutadd_recompiles_a_line_seen_before(tmp_path):
+  out, saved = run(tmp_path, "16 zz", "scutadd zz sqrt", "16 zz")
+  assert "Invalid Operator: zz" in out
+  assert saved["stack"][:2] == [4.0, 16.0]
+
+
+def test_bad_number_stops_the_line(tmp_path):
+  out, saved = run(tmp_path, "5 1,5 * 7")
+  assert "Value error: 1,5" in out
+  assert saved["stack"][0] == 5.0
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script editor")
+def test_edit_reloads_the_changed_program(tmp_path):
+  editor = tmp_path / "editor.sh"
+  editor.write_text('#!/bin/sh\nprintf "LBL a 22 RTN\\n" > "$1"\n')
+  editor.chmod(editor.stat().st_mode | stat.S_IXUSR)
+  _, saved = run(
+    tmp_path,
+    "exc a",
+    "edit",
+    "exc a",
+    prog="LBL a 1 RTN\n",
+    env={"EDITOR": str(editor)},
+  )
+  assert saved["stack"][:2] == [22.0, 1.0]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script editor")
+def test_edit_keeps_the_program_if_the_file_is_gone(tmp_path):
+  editor = tmp_path / "editor.sh"
+  editor.write_text('#!/bin/sh\nrm "$1"\n')
+  editor.chmod(editor.stat().st_mode | stat.S_IXUSR)
+  out, saved = run(
+    tmp_path,
+    "edit",
+    "exc a",
+    prog="LBL a 1 RTN\n",
+    env={"EDITOR": str(editor)},
+  )
+  assert "rpn.txt" in out and "not found" in out
+  assert saved["stack"][0] == 1.0